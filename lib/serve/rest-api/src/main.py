@@ -30,6 +30,7 @@ from loguru import logger
 from .api.routes import router
 from .lisa_serve.registry import registry
 from .utils.cache_manager import set_registered_models_cache
+from .utils.gzip_request import GzipRequestMiddleware
 from .utils.resources import ModelType, RestApiResource
 
 logger.remove()
@@ -141,6 +142,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Accept gzip-compressed request bodies
+app.add_middleware(GzipRequestMiddleware)
+
 
 ##############
 # MIDDLEWARE #
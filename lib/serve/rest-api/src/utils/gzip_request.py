@@ -0,0 +1,96 @@
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Middleware for decompressing gzip-encoded request bodies."""
+import zlib
+from typing import List, Tuple
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bound on the decompressed size of a request body, in bytes
+MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+
+class GzipRequestMiddleware:
+    """
+    Decompresses request bodies sent with `Content-Encoding: gzip`.
+
+    Requests without that header are passed through untouched, so clients that do not
+    compress their bodies are unaffected.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int = MAX_DECOMPRESSED_SIZE) -> None:
+        """Initialize the middleware."""
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Decompress the request body, if needed, before calling the next application."""
+        if scope["type"] != "http" or not _is_gzip(scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks: List[bytes] = []
+        size = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                more_body = message.get("more_body", False)
+                chunk = decompressor.decompress(message.get("body", b""), self.max_size - size + 1)
+                size += len(chunk)
+                if size > self.max_size:
+                    response = PlainTextResponse("Request body too large", status_code=413)
+                    await response(scope, receive, send)
+                    return
+                chunks.append(chunk)
+            chunks.append(decompressor.flush())
+            # A truncated stream or trailing bytes after it mean the body was not one complete gzip member
+            valid = decompressor.eof and not decompressor.unused_data
+        except zlib.error:
+            valid = False
+        if not valid:
+            response = PlainTextResponse("Invalid gzip request body", status_code=400)
+            await response(scope, receive, send)
+            return
+
+        body = b"".join(chunks)
+        headers = [
+            (name, value) for name, value in scope["headers"] if name not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        scope = dict(scope, headers=headers)
+
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, receive_body, send)
+
+
+def _is_gzip(headers: List[Tuple[bytes, bytes]]) -> bool:
+    """Check whether the request body is gzip-encoded."""
+    for name, value in headers:
+        if name == b"content-encoding":
+            return value.strip().lower() == b"gzip"
+    return False
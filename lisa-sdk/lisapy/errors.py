@@ -13,7 +13,7 @@
 #   limitations under the License.
 
 """Custom errors."""
-from requests import Response
+from httpx import Response
 
 
 class RateLimitExceededError(Exception):
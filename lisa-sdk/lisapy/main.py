@@ -13,23 +13,98 @@
 #   limitations under the License.
 
 """LISA SDK."""
-import json
+import asyncio
+import gzip
 import logging
+import os
+import ssl
 import sys
-from typing import Any, AsyncGenerator, Dict, Generator, List, Optional, Union
-
-import requests
-from aiohttp import ClientSession, ClientTimeout
-from pydantic import BaseModel, ConfigDict, Field, field_validator
-from requests import Session
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    overload,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from cachetools import TTLCache
+from httpx import AsyncClient, AsyncHTTPTransport, Client, HTTPTransport, Limits
+from httpx import Request as HTTPRequest
+from httpx import Response as HTTPResponse
+from httpx import Timeout
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema, CoreSchema
 
 from .errors import parse_error
-from .types import FoundationModel, Response, StreamingResponse
+from .types import FoundationModel, ModelType, Response, StreamingResponse
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    from orjson import dumps as json_dumps
+    from orjson import loads as json_loads
+except ImportError:
+    # pydantic-core ships with pydantic and serializes to compact JSON bytes directly
+    from pydantic_core import from_json as json_loads  # type: ignore[assignment]
+    from pydantic_core import to_json as json_dumps  # type: ignore[assignment]
+
 
 logging.basicConfig(level=logging.INFO)
+# httpx logs every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+logger = logging.getLogger(__name__)
 
 API_VERSION = "v1"
 
+# Connection pool sizing and connection retries for the sync and async HTTP clients
+POOL_LIMITS = Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+CONNECT_RETRIES = 3
+
+# Idempotent requests are retried with exponential backoff when a gateway reports the service unavailable
+STATUS_RETRIES = 3
+RETRY_BACKOFF = 0.2
+RETRY_STATUSES = frozenset({502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+# Maximum number of in-flight requests when describing several models
+DESCRIBE_CONCURRENCY = 8
+
+# Size and lifetime in seconds of the per-client model metadata cache
+DESCRIBE_CACHE_SIZE = 1024
+DESCRIBE_CACHE_TTL = 300
+
+# Embedding requests are split into batches of this many texts, sent concurrently
+EMBED_BATCH_SIZE = 64
+EMBED_CONCURRENCY = 8
+
+# Headers for requests with a pre-serialized JSON body
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Embedding request bodies larger than this many bytes are gzip-compressed when `compress_requests` is set
+COMPRESS_MIN_BYTES = 4096
+COMPRESS_LEVEL = 1
+GZIP_JSON_HEADERS = {**JSON_HEADERS, "Content-Encoding": "gzip"}
+
 
 def on_llm_new_token(token: str) -> None:
     """Handle new tokens during streaming."""
@@ -37,40 +112,340 @@ def on_llm_new_token(token: str) -> None:
     sys.stdout.flush()
 
 
-class Lisa(BaseModel):
+def on_llm_new_token_bytes(token: bytes) -> None:
+    """Handle new tokens during streaming, for consumers that work with UTF-8 bytes."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # Notebook and other in-memory text streams have no binary buffer
+        sys.stdout.write(token.decode("utf-8"))
+        sys.stdout.flush()
+        return
+    buffer.write(token)
+    buffer.flush()
+
+
+async def _close_on_loop_shutdown(session: AsyncClient) -> AsyncGenerator[None, None]:
+    """Hold an async client open until the generator is closed, by `Lisa.aclose` or the event loop shutdown."""
+    try:
+        yield
+    finally:
+        await session.aclose()
+
+
+def _build_payload(model: FoundationModel, text: Union[str, List[str]]) -> Dict[str, Any]:
+    """Build a request payload, leaving out empty model kwargs so the server defaults apply."""
+    payload: Dict[str, Any] = {"provider": model.provider, "modelName": model.model_name, "text": text}
+    # Dumped per request, callers tune model kwargs in place
+    model_kwargs = model.model_kwargs.model_dump() if model.model_kwargs else None
+    if model_kwargs:
+        payload["modelKwargs"] = model_kwargs
+    return payload
+
+
+def _to_numpy(embeddings: List[List[float]]) -> "np.ndarray":
+    """Pack embeddings into a contiguous float32 array."""
+    import numpy as np
+
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def _iter_lines(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Split a stream of byte chunks into lines."""
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        yield from lines
+    if buffer:
+        yield buffer
+
+
+async def _aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split an async stream of byte chunks into lines."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def _parse_sse_event(line: bytes) -> Optional[StreamingResponse]:
+    """Parse a server-sent event line from the generateStream endpoint.
+
+    Blank lines, comments (keep-alives), non-data fields and the `[DONE]` sentinel yield no event.
+    """
+    if not line.startswith(b"data:"):
+        return None
+    payload = line[5:].strip()
+    if not payload or payload == b"[DONE]":
+        return None
+
+    event = json_loads(payload)
+    if "finishReason" in event:
+        return StreamingResponse(  # nosec [B106]
+            token="",
+            finish_reason=event["finishReason"],
+            generated_tokens=event["generatedTokens"],
+        )
+    token = event["token"]["text"]
+    return StreamingResponse(token=token, token_bytes=token.encode("utf-8"))
+
+
+class _RetryTransport(HTTPTransport):
+    """HTTP transport that also retries idempotent requests on gateway errors."""
+
+    def handle_request(self, request: HTTPRequest) -> HTTPResponse:
+        response = super().handle_request(request)
+        if request.method not in RETRY_METHODS:
+            return response
+        for attempt in range(STATUS_RETRIES):
+            if response.status_code not in RETRY_STATUSES:
+                break
+            response.close()
+            time.sleep(RETRY_BACKOFF * 2**attempt)
+            response = super().handle_request(request)
+        return response
+
+
+class _AsyncRetryTransport(AsyncHTTPTransport):
+    """Async HTTP transport that also retries idempotent requests on gateway errors."""
+
+    async def handle_async_request(self, request: HTTPRequest) -> HTTPResponse:
+        response = await super().handle_async_request(request)
+        if request.method not in RETRY_METHODS:
+            return response
+        for attempt in range(STATUS_RETRIES):
+            if response.status_code not in RETRY_STATUSES:
+                break
+            await response.aclose()
+            await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
+            response = await super().handle_async_request(request)
+        return response
+
+
+@dataclass(slots=True, eq=False)
+class Lisa:
     """A wrapper around the LISA REST API."""
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    url: str
+    """REST API url."""
+
+    headers: Optional[Dict[str, str]] = None
+    """Headers for request."""
+
+    cookies: Optional[Dict[str, str]] = None
+    """Cookies for request."""
+
+    timeout: int = 10
+    """Timeout in minutes request."""
+
+    verify: Optional[Union[str, bool]] = None
+    """Whether to verify SSL certificates, or the path to a CA bundle file or directory."""
 
-    url: str = Field(..., description="REST API url.")
-    headers: Optional[Dict[str, str]] = Field(None, description="Headers for request.")
-    cookies: Optional[Dict[str, str]] = Field(None, description="Cookies for request.")
-    timeout: int = Field(10, description="Timeout in minutes request.")
-    verify: Optional[Union[str, bool]] = Field(None, description="Whether to verify SSL certificates.")
-    async_timeout: Optional[ClientTimeout] = None  # Do not provide a default value here
+    async_timeout: Optional[Union[Timeout, float]] = None
+    """Timeout for async requests in seconds or as an `httpx.Timeout`, defaults to `timeout`.
 
-    _session: Session
+    An `aiohttp.ClientTimeout`, accepted by earlier releases, is converted using its `total`.
+    """
 
-    @field_validator("url")
-    def validate_url(cls: "Lisa", v: str) -> str:
+    compress_requests: bool = False
+    """Whether to gzip large embedding request bodies, requires a server that accepts gzip-encoded requests."""
+
+    _session: Client = field(init=False, repr=False)
+    _url_describe: str = field(init=False, repr=False)
+    _url_describe_models: str = field(init=False, repr=False)
+    _url_generate: str = field(init=False, repr=False)
+    _url_generate_stream: str = field(init=False, repr=False)
+    _url_embeddings: str = field(init=False, repr=False)
+    _async_session: Optional[AsyncClient] = field(default=None, init=False, repr=False)
+    _async_session_loop: Optional[asyncio.AbstractEventLoop] = field(default=None, init=False, repr=False)
+    _async_session_closer: Optional[AsyncGenerator[None, None]] = field(default=None, init=False, repr=False)
+    _describe_cache: TTLCache = field(init=False, repr=False)
+    _describe_lock: threading.Lock = field(init=False, repr=False)
+
+    @classmethod
+    def validate_url(cls, v: str) -> str:
         """Validate URL is properly formatted."""
         url = v.rstrip("/")
         if not url.endswith(API_VERSION):
             url = f"{url}/{API_VERSION}"
         return url
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
+    @classmethod
+    def validate_timeout(cls, v: Any) -> int:
+        """Validate the timeout is a whole number of minutes, coercing numeric strings."""
+        message = f"timeout must be a whole number of minutes, got {v!r}"
+        if isinstance(v, bool):
+            raise ValueError(message)
+        try:
+            timeout = float(v)
+        except (TypeError, ValueError):
+            raise ValueError(message) from None
+        if not timeout.is_integer() or timeout < 0:
+            raise ValueError(message)
+        return int(timeout)
+
+    @classmethod
+    def validate_verify(cls, v: Any) -> Optional[Union[str, bool]]:
+        """Validate verify is a boolean or a CA bundle path."""
+        if v is not None and not isinstance(v, (str, bool)):
+            raise ValueError(f"verify must be a boolean or a CA bundle path, got {v!r}")
+        return v
+
+    @classmethod
+    def validate_async_timeout(cls, v: Any) -> Optional[Timeout]:
+        """Validate the async timeout, converting seconds and legacy `aiohttp.ClientTimeout` values."""
+        if v is None or isinstance(v, Timeout):
+            return v
+        if isinstance(v, (int, float)) and not isinstance(v, bool):
+            return Timeout(v)
+        if hasattr(v, "total"):
+            warnings.warn(
+                "Passing an aiohttp.ClientTimeout as async_timeout is deprecated, pass an httpx.Timeout or seconds.",
+                DeprecationWarning,
+                stacklevel=4,
+            )
+            return Timeout(v.total)
+        raise ValueError(f"async_timeout must be an httpx.Timeout or a number of seconds, got {v!r}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> CoreSchema:
+        """Let pydantic models hold a client as an opaque value, checked with isinstance."""
+        return core_schema.is_instance_schema(cls)
+
+    def __post_init__(self) -> None:
+        self.url = self.validate_url(self.url)
+        self.timeout = self.validate_timeout(self.timeout)
+        self.verify = self.validate_verify(self.verify)
+        self.async_timeout = self.validate_async_timeout(self.async_timeout)
+
+        self._url_describe = f"{self.url}/describeModel"
+        self._url_describe_models = f"{self.url}/describeModels"
+        self._url_generate = f"{self.url}/generate"
+        self._url_generate_stream = f"{self.url}/generateStream"
+        self._url_embeddings = f"{self.url}/embeddings"
+
+        transport_kwargs = self._transport_kwargs()
+        self._session = Client(
+            transport=_RetryTransport(**transport_kwargs),
+            mounts={
+                pattern: _RetryTransport(proxy=proxy, **transport_kwargs)
+                for pattern, proxy in self._env_proxies().items()
+            },
+            headers=self.headers,
+            cookies=self.cookies,
+            timeout=self.timeout * 60,
+            follow_redirects=True,
+        )
+
+        if self.async_timeout is None:
+            self.async_timeout = Timeout(self.timeout * 60)
+
+        self._describe_cache = TTLCache(maxsize=DESCRIBE_CACHE_SIZE, ttl=DESCRIBE_CACHE_TTL)
+        self._describe_lock = threading.Lock()
 
-        self._session = requests.Session()
-        if self.headers:
-            self._session.headers = self.headers  # type: ignore
-        if self.verify is not None:
-            self._session.verify = self.verify
-        if self.cookies:
-            self._session.cookies = self.cookies  # type: ignore
+    def _ssl_context(self) -> Union[ssl.SSLContext, bool]:
+        """Build the SSL verification setting from `verify`, which may be a CA bundle file or directory."""
+        if isinstance(self.verify, str):
+            if os.path.isdir(self.verify):
+                return ssl.create_default_context(capath=self.verify)
+            return ssl.create_default_context(cafile=self.verify)
+        return self.verify if self.verify is not None else True
 
-        self.async_timeout = ClientTimeout(self.timeout * 60)
+    def _transport_kwargs(self) -> Dict[str, Any]:
+        """Arguments shared by every transport of the sync and async clients."""
+        return {"http2": True, "verify": self._ssl_context(), "limits": POOL_LIMITS, "retries": CONNECT_RETRIES}
+
+    def _env_proxies(self) -> Dict[str, str]:
+        """Map URL schemes to the proxies set in the environment, unless NO_PROXY covers the API host.
+
+        httpx only reads HTTP_PROXY, HTTPS_PROXY, ALL_PROXY and NO_PROXY when it builds its own transport, so the
+        retrying transports are mounted per proxy from the same variables, as requests did.
+        """
+        host = urlsplit(self.url).hostname
+        if not host or proxy_bypass(host):
+            return {}
+        proxies = getproxies()
+        mounts = {}
+        for scheme in ("http", "https"):
+            proxy = proxies.get(scheme) or proxies.get("all")
+            if proxy:
+                mounts[f"{scheme}://"] = proxy if "://" in proxy else f"http://{proxy}"
+        return mounts
+
+    async def _get_async_session(self) -> AsyncClient:
+        """Get the shared async client, creating it on the running event loop on first use.
+
+        The client is bound to the loop it was created on. Its connections are closed when that loop shuts
+        down its async generators, as `asyncio.run` does, so a client left behind by an earlier loop does not
+        keep its sockets open.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.is_closed or self._async_session_loop is not loop:
+            transport_kwargs = self._transport_kwargs()
+            session = AsyncClient(
+                transport=_AsyncRetryTransport(**transport_kwargs),
+                mounts={
+                    pattern: _AsyncRetryTransport(proxy=proxy, **transport_kwargs)
+                    for pattern, proxy in self._env_proxies().items()
+                },
+                headers=self.headers,
+                cookies=self.cookies,
+                timeout=self.async_timeout,
+                follow_redirects=True,
+            )
+            closer = _close_on_loop_shutdown(session)
+            await closer.asend(None)
+            self._async_session = session
+            self._async_session_loop = loop
+            self._async_session_closer = closer
+        return self._async_session
+
+    def close(self) -> None:
+        """Close the sync client."""
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """Close the shared async client."""
+        closer = self._async_session_closer
+        if closer is not None and self._async_session_loop is asyncio.get_running_loop():
+            await closer.aclose()
+        self._async_session = None
+        self._async_session_loop = None
+        self._async_session_closer = None
+
+    def __enter__(self) -> "Lisa":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "Lisa":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+        self.close()
+
+    def clear_model_cache(self) -> None:
+        """Clear cached model metadata so the next describe call fetches it again."""
+        with self._describe_lock:
+            self._describe_cache.clear()
+
+    def _get_cached_model(self, provider: str, model_name: str) -> Optional[FoundationModel]:
+        """Get a copy of cached model metadata, if present and not expired."""
+        with self._describe_lock:
+            model = self._describe_cache.get((provider, model_name))
+        # Callers tune model kwargs in place, so never hand out the cached instance
+        return model.model_copy(deep=True) if model is not None else None
+
+    def _cache_model(self, model: FoundationModel) -> None:
+        """Cache model metadata."""
+        with self._describe_lock:
+            self._describe_cache[(model.provider, model.model_name)] = model.model_copy(deep=True)
 
     def describe_model(self, provider: str, model_name: str) -> FoundationModel:
         """Get model metadata.
@@ -88,74 +463,132 @@ class Lisa(BaseModel):
         Dict[str, str]
             Model metadata.
         """
-        response = self._session.get(f"{self.url}/describeModel?provider={provider}&modelName={model_name}")
+        model = self._get_cached_model(provider, model_name)
+        if model is not None:
+            return model
+
+        response = self._session.get(self._url_describe, params={"provider": provider, "modelName": model_name})
         if response.status_code == 200:
-            return FoundationModel.from_dict(response.json())
+            model = FoundationModel.from_dict(json_loads(response.content))
+            self._cache_model(model)
+            return model
         else:
             raise parse_error(response.status_code, response)
 
-    def list_models(self) -> List[FoundationModel]:
-        """List all foundation models.
+    async def adescribe_model(self, provider: str, model_name: str) -> FoundationModel:
+        """Get model metadata.
+
+        Parameters
+        ----------
+        provider : str
+            Name of provider.
+
+        model_name : str
+            Name of model.
 
         Returns
         -------
-        List[FoundationModel]
-            List of available text generation and embedding foundation models.
+        FoundationModel
+            Model metadata.
         """
-        response = self._session.get(f"{self.url}/listModels")
+        model = self._get_cached_model(provider, model_name)
+        if model is not None:
+            return model
+
+        session = await self._get_async_session()
+        response = await session.get(self._url_describe, params={"provider": provider, "modelName": model_name})
         if response.status_code == 200:
-            json_models = response.json()
-            models = [
-                self.describe_model(provider=provider, model_name=model_name)
-                for model_type, providers in json_models.items()
-                for provider, model_names in providers.items()
-                for model_name in model_names
-            ]
+            model = FoundationModel.from_dict(json_loads(response.content))
+            self._cache_model(model)
+            return model
         else:
             raise parse_error(response.status_code, response)
-        return models
 
-    def list_textgen_models(self) -> List[FoundationModel]:
-        """List all text generation foundation models.
+    async def adescribe_models(
+        self, models: List[Tuple[str, str]], max_concurrency: int = DESCRIBE_CONCURRENCY
+    ) -> List[FoundationModel]:
+        """Get metadata for several models concurrently.
+
+        Parameters
+        ----------
+        models : List[Tuple[str, str]]
+            Pairs of provider and model name.
+
+        max_concurrency : int
+            Maximum number of requests in flight at once.
 
         Returns
         -------
         List[FoundationModel]
-            List of available text generation foundation models.
+            Model metadata, in the same order as `models`.
         """
-        response = self._session.get(f"{self.url}/listModels?modelTypes=textgen")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def describe(provider: str, model_name: str) -> FoundationModel:
+            async with semaphore:
+                return await self.adescribe_model(provider, model_name)
+
+        return list(await asyncio.gather(*(describe(provider, model_name) for provider, model_name in models)))
+
+    def _list_models(self, model_type: Optional[ModelType] = None) -> List[FoundationModel]:
+        """List foundation models with their metadata in a single request.
+
+        Parameters
+        ----------
+        model_type : Optional[ModelType]
+            Type of models to list. If not provided, all model types are listed.
+
+        Returns
+        -------
+        List[FoundationModel]
+            List of available foundation models.
+        """
+        params = {"modelTypes": ModelType(model_type).value} if model_type else None
+        response = self._session.get(self._url_describe_models, params=params)
         if response.status_code == 200:
-            json_models = response.json()
+            json_models = json_loads(response.content)
             models = [
-                self.describe_model(provider=provider, model_name=model_name)
-                for model_type, providers in json_models.items()
-                for provider, model_names in providers.items()
-                for model_name in model_names
+                FoundationModel.from_dict(model)
+                for providers in json_models.values()
+                for models in (providers or {}).values()
+                for model in models
             ]
+            # Listing already returns full metadata, so later describe calls can be served from the cache
+            for model in models:
+                self._cache_model(model)
             return models
         else:
             raise parse_error(response.status_code, response)
 
+    def list_models(self) -> List[FoundationModel]:
+        """List all foundation models.
+
+        Returns
+        -------
+        List[FoundationModel]
+            List of available text generation and embedding foundation models.
+        """
+        return self._list_models()
+
+    def list_textgen_models(self) -> List[FoundationModel]:
+        """List all text generation foundation models.
+
+        Returns
+        -------
+        List[FoundationModel]
+            List of available text generation foundation models.
+        """
+        return self._list_models(ModelType.TEXTGEN)
+
     def list_embedding_models(self) -> List[FoundationModel]:
         """List all embedding foundation models.
 
         Returns
         -------
         List[FoundationModel]
-            List of available text generation foundation models.
+            List of available embedding foundation models.
         """
-        response = self._session.get(f"{self.url}/listModels?modelTypes=embedding")
-        if response.status_code == 200:
-            json_models = response.json()
-            models = [
-                self.describe_model(provider=provider, model_name=model_name)
-                for model_type, providers in json_models.items()
-                for provider, model_names in providers.items()
-                for model_name in model_names
-            ]
-            return models
-        else:
-            raise parse_error(response.status_code, response)
+        return self._list_models(ModelType.EMBEDDING)
 
     def generate(self, prompt: str, model: FoundationModel) -> Response:
         """Generate text based on the provided prompt using a specific model.
@@ -173,15 +606,10 @@ class Lisa(BaseModel):
         Response
             Text generation response.
         """
-        payload = {
-            "provider": model.provider,
-            "modelName": model.model_name,
-            "text": prompt,
-            "modelKwargs": model.model_kwargs.model_dump() if model.model_kwargs else {},
-        }
-        response = self._session.post(f"{self.url}/generate", json=payload)
+        payload = _build_payload(model, prompt)
+        response = self._session.post(self._url_generate, content=json_dumps(payload), headers=JSON_HEADERS)
         if response.status_code == 200:
-            output = response.json()
+            output = json_loads(response.content)
             return Response(
                 generated_text=output["generatedText"],
                 generated_tokens=output["generatedTokens"],
@@ -211,27 +639,18 @@ class Lisa(BaseModel):
         Response
             Text generation response.
         """
-        payload = {
-            "provider": model.provider,
-            "modelName": model.model_name,
-            "text": prompt,
-            "modelKwargs": model.model_kwargs.model_dump() if model.model_kwargs else {},
-        }
-        async with ClientSession(
-            headers=self.headers,
-            cookies=self.cookies,
-            timeout=self.async_timeout,
-        ) as session:
-            async with session.post(f"{self.url}/generate", json=payload, ssl=self.verify) as response:
-                output = await response.json()
-                if response.status == 200:
-                    return Response(
-                        generated_text=output["generatedText"],
-                        generated_tokens=output["generatedTokens"],
-                        finish_reason=output["finishReason"],
-                    )
-                else:
-                    raise parse_error(response.status_code, response)
+        payload = _build_payload(model, prompt)
+        session = await self._get_async_session()
+        response = await session.post(self._url_generate, content=json_dumps(payload), headers=JSON_HEADERS)
+        if response.status_code == 200:
+            output = json_loads(response.content)
+            return Response(
+                generated_text=output["generatedText"],
+                generated_tokens=output["generatedTokens"],
+                finish_reason=output["finishReason"],
+            )
+        else:
+            raise parse_error(response.status_code, response)
 
     def generate_stream(self, prompt: str, model: FoundationModel) -> Generator[StreamingResponse, None, None]:
         """Generate text with streaming based on the provided prompt using a specific model.
@@ -249,32 +668,17 @@ class Lisa(BaseModel):
         Generator[StreamingResponse, None, None]
             Text generation streaming response.
         """
-        request = {
-            "provider": model.provider,
-            "modelName": model.model_name,
-            "text": prompt,
-            "modelKwargs": model.model_kwargs.model_dump() if model.model_kwargs else {},
-        }
-        response = self._session.post(f"{self.url}/generateStream", json=request)
-        if response.status_code == 200:
-            for resp_line in response.iter_lines():
-                if resp_line == "b\n":
-                    continue
-                payload = resp_line.decode("utf-8")
-                if payload.startswith("data:"):
-                    json_payload = json.loads(payload.removeprefix("data:").rstrip("/n"))
-                    if "finishReason" in json_payload:
-                        yield StreamingResponse(  # nosec [B106]
-                            token="",
-                            finish_reason=json_payload["finishReason"],
-                            generated_tokens=json_payload["generatedTokens"],
-                        )
-                    else:
-                        yield StreamingResponse(
-                            token=json_payload["token"]["text"],
-                        )
-        else:
-            raise parse_error(response.status_code, response)
+        request = _build_payload(model, prompt)
+        with self._session.stream(
+            "POST", self._url_generate_stream, content=json_dumps(request), headers=JSON_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                response.read()
+                raise parse_error(response.status_code, response)
+            for resp_line in _iter_lines(response.iter_bytes()):
+                event = _parse_sse_event(resp_line)
+                if event is not None:
+                    yield event
 
     async def agenerate_stream(
         self,
@@ -296,40 +700,58 @@ class Lisa(BaseModel):
         AsyncGenerator[StreamingResponse, None]
             Text generation streaming response.
         """
-        request = {
-            "provider": model.provider,
-            "modelName": model.model_name,
-            "text": prompt,
-            "modelKwargs": model.model_kwargs.model_dump() if model.model_kwargs else {},
-        }
-        async with ClientSession(
-            headers=self.headers,
-            cookies=self.cookies,
-            timeout=self.async_timeout,
-        ) as session:
-            async with session.post(f"{self.url}/generateStream", json=request, ssl=self.verify) as response:
-                if response.status != 200:
-                    payload = await response.json()
-                    # TODO this probably won't work
-                    raise parse_error(response.status_code, response)
-                async for resp_line in response.content:
-                    if resp_line == "b\n":
-                        continue
-                    payload = resp_line.decode("utf-8")
-                    if payload.startswith("data:"):
-                        json_payload = json.loads(payload.removeprefix("data:").rstrip("/n"))
-                        if "finishReason" in json_payload:
-                            yield StreamingResponse(  # nosec [B106]
-                                token="",
-                                finish_reason=json_payload["finishReason"],
-                                generated_tokens=json_payload["generatedTokens"],
-                            )
-                        else:
-                            yield StreamingResponse(
-                                token=json_payload["token"]["text"],
-                            )
-
-    def embed(self, texts: Union[str, List[str]], model: FoundationModel) -> List[List[float]]:
+        request = _build_payload(model, prompt)
+        session = await self._get_async_session()
+        async with session.stream(
+            "POST", self._url_generate_stream, content=json_dumps(request), headers=JSON_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise parse_error(response.status_code, response)
+            async for resp_line in _aiter_lines(response.aiter_bytes()):
+                event = _parse_sse_event(resp_line)
+                if event is not None:
+                    yield event
+
+    @overload
+    def embed(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        return_numpy: Literal[False] = ...,
+    ) -> List[List[float]]: ...
+
+    @overload
+    def embed(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        *,
+        return_numpy: Literal[True],
+    ) -> "np.ndarray": ...
+
+    @overload
+    def embed(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        return_numpy: bool = ...,
+    ) -> Union[List[List[float]], "np.ndarray"]: ...
+
+    def embed(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_concurrency: int = EMBED_CONCURRENCY,
+        return_numpy: bool = False,
+    ) -> Union[List[List[float]], "np.ndarray"]:
         """Generate text embeddings based on the provided prompt using a specific model.
 
         Parameters
@@ -340,25 +762,86 @@ class Lisa(BaseModel):
         model : FoundationModel
             Foundation model for text embeddings.
 
+        batch_size : int
+            Maximum number of texts sent in a single request.
+
+        max_concurrency : int
+            Maximum number of requests in flight at once.
+
+        return_numpy : bool
+            Whether to return the embeddings as a float32 NumPy array. Requires `numpy`.
+
         Returns
         -------
-        List[List[float]]
+        Union[List[List[float]], np.ndarray]
             Text embeddings as a batched response.
         """
-        payload = {
-            "provider": model.provider,
-            "modelName": model.model_name,
-            "text": texts,
-            "modelKwargs": model.model_kwargs.model_dump() if model.model_kwargs else {},
-        }
-        response = self._session.post(f"{self.url}/embeddings", json=payload)
+        if isinstance(texts, str) or len(texts) <= batch_size:
+            embeddings = self._embed_batch(texts, model)
+        else:
+            batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                results = executor.map(lambda batch: self._embed_batch(batch, model), batches)
+                embeddings = [embedding for batch in results for embedding in batch]
+        return _to_numpy(embeddings) if return_numpy else embeddings
+
+    def _encode_body(self, payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize a request payload, gzip-compressing it if enabled and large enough to be worth it."""
+        body = json_dumps(payload)
+        if self.compress_requests and len(body) > COMPRESS_MIN_BYTES:
+            return gzip.compress(body, compresslevel=COMPRESS_LEVEL), GZIP_JSON_HEADERS
+        return body, JSON_HEADERS
+
+    def _embed_batch(self, texts: Union[str, List[str]], model: FoundationModel) -> List[List[float]]:
+        """Generate text embeddings for a single request."""
+        payload = _build_payload(model, texts)
+        content, headers = self._encode_body(payload)
+        response = self._session.post(self._url_embeddings, content=content, headers=headers)
         if response.status_code == 200:
-            output = response.json()
+            output = json_loads(response.content)
             return output["embeddings"]  # type: ignore
         else:
             raise parse_error(response.status_code, response)
 
-    async def aembed(self, texts: Union[str, List[str]], model: FoundationModel) -> List[List[float]]:
+    @overload
+    async def aembed(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        return_numpy: Literal[False] = ...,
+    ) -> List[List[float]]: ...
+
+    @overload
+    async def aembed(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        *,
+        return_numpy: Literal[True],
+    ) -> "np.ndarray": ...
+
+    @overload
+    async def aembed(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        return_numpy: bool = ...,
+    ) -> Union[List[List[float]], "np.ndarray"]: ...
+
+    async def aembed(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_concurrency: int = EMBED_CONCURRENCY,
+        return_numpy: bool = False,
+    ) -> Union[List[List[float]], "np.ndarray"]:
         """Generate text embeddings based on the provided prompt using a specific model.
 
         Parameters
@@ -369,33 +852,131 @@ class Lisa(BaseModel):
         model : FoundationModel
             Foundation model for text embeddings.
 
+        batch_size : int
+            Maximum number of texts sent in a single request.
+
+        max_concurrency : int
+            Maximum number of requests in flight at once.
+
+        return_numpy : bool
+            Whether to return the embeddings as a float32 NumPy array. Requires `numpy`.
+
         Returns
         -------
-        List[List[float]]
+        Union[List[List[float]], np.ndarray]
             Text embeddings as a batched response.
         """
-        payload = {
-            "provider": model.provider,
-            "modelName": model.model_name,
-            "text": texts,
-            "modelKwargs": model.model_kwargs.model_dump() if model.model_kwargs else {},
-        }
-        async with ClientSession(
-            headers=self.headers,
-            cookies=self.cookies,
-            timeout=self.async_timeout,
-        ) as session:
-            async with session.post(f"{self.url}/embeddings", json=payload, ssl=False) as response:
-                if response.status != 200:
-                    output = await response.json()
-                    raise parse_error(response.status_code, response)
+        if isinstance(texts, str) or len(texts) <= batch_size:
+            embeddings = await self._aembed_batch(texts, model)
+        else:
+            embeddings = [
+                embedding
+                async for batch in self.aembed_stream(texts, model, batch_size, max_concurrency)
+                for embedding in batch
+            ]
+        return _to_numpy(embeddings) if return_numpy else embeddings
+
+    @overload
+    def aembed_stream(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        return_numpy: Literal[False] = ...,
+    ) -> AsyncGenerator[List[List[float]], None]: ...
+
+    @overload
+    def aembed_stream(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        *,
+        return_numpy: Literal[True],
+    ) -> AsyncGenerator["np.ndarray", None]: ...
+
+    @overload
+    def aembed_stream(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = ...,
+        max_concurrency: int = ...,
+        return_numpy: bool = ...,
+    ) -> AsyncGenerator[Union[List[List[float]], "np.ndarray"], None]: ...
 
-                output = await response.json()
-                return output["embeddings"]  # type: ignore
+    async def aembed_stream(
+        self,
+        texts: Union[str, List[str]],
+        model: FoundationModel,
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_concurrency: int = EMBED_CONCURRENCY,
+        return_numpy: bool = False,
+    ) -> AsyncGenerator[Union[List[List[float]], "np.ndarray"], None]:
+        """Generate text embeddings batch by batch, without holding every embedding in memory.
+
+        Parameters
+        ----------
+        texts : Union[str, List[str]]
+            Input text or texts.
+
+        model : FoundationModel
+            Foundation model for text embeddings.
+
+        batch_size : int
+            Maximum number of texts sent in a single request.
+
+        max_concurrency : int
+            Maximum number of requests in flight at once.
+
+        return_numpy : bool
+            Whether to yield each batch as a float32 NumPy array. Requires `numpy`.
+
+        Returns
+        -------
+        AsyncGenerator[Union[List[List[float]], np.ndarray], None]
+            Embeddings for each batch of `batch_size` texts, in input order.
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        batches = (texts[i : i + batch_size] for i in range(0, len(texts), batch_size))
+        pending: Deque["asyncio.Task[List[List[float]]]"] = deque(
+            asyncio.ensure_future(self._aembed_batch(batch, model)) for batch in islice(batches, max_concurrency)
+        )
+        try:
+            while pending:
+                embeddings = await pending.popleft()
+                # Keep the window full while the caller consumes this batch
+                for batch in islice(batches, 1):
+                    pending.append(asyncio.ensure_future(self._aembed_batch(batch, model)))
+                yield _to_numpy(embeddings) if return_numpy else embeddings
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _aembed_batch(self, texts: Union[str, List[str]], model: FoundationModel) -> List[List[float]]:
+        """Generate text embeddings for a single request."""
+        payload = _build_payload(model, texts)
+        session = await self._get_async_session()
+        content, headers = self._encode_body(payload)
+        response = await session.post(self._url_embeddings, content=content, headers=headers)
+        if response.status_code == 200:
+            output = json_loads(response.content)
+            return output["embeddings"]  # type: ignore
+        else:
+            raise parse_error(response.status_code, response)
 
     def __del__(self) -> None:
-        """Close session."""
+        """Close the clients as a fallback when `close`/`aclose` or a `with` block was not used."""
         try:
-            self._session.close()
+            if not self._session.is_closed:
+                logger.debug("Closing LISA client from its finalizer, prefer close() or a with block.")
+                self._session.close()
+            # The async client can only be closed on its own loop, schedule that if the loop is still alive
+            loop = self._async_session_loop
+            if self._async_session_closer is not None and loop is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(loop.create_task, self._async_session_closer.aclose())
         except Exception:
             pass
@@ -16,7 +16,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -75,3 +75,9 @@ class StreamingResponse(BaseModel):
     token: str = Field(..., description="Generated token")
     finish_reason: Optional[str] = Field(None, description="Generation finish reason when stream is complete.")
     generated_tokens: Optional[int] = Field(None, description="Number of generated tokens when stream is complete.")
+    token_bytes: bytes = Field(default=b"", exclude=True, repr=False, description="Generated token encoded as UTF-8.")
+
+    def model_post_init(self, __context: Any) -> None:
+        """Encode the token once, unless the bytes were passed in."""
+        if self.token and not self.token_bytes:
+            self.token_bytes = self.token.encode("utf-8")
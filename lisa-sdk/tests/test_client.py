@@ -14,12 +14,16 @@
 
 """Test basic usage of the Lisapy SDK."""
 
+import io
+import sys
+from pathlib import Path
 from typing import Any, Union
 
 import pytest
 from lisapy import Lisa
 from lisapy.errors import NotFoundError
-from lisapy.types import ModelKwargs, ModelType
+from lisapy.main import _build_payload, on_llm_new_token_bytes
+from lisapy.types import FoundationModel, ModelKwargs, ModelType
 
 
 @pytest.fixture(scope="session")
@@ -142,3 +146,157 @@ async def test_generate_stream_async(url: str, verify: Union[bool, str]) -> None
     assert response.token == ""
     assert response.finish_reason == "length"
     assert response.generated_tokens == 1
+
+
+def test_model_kwargs_in_place_edit() -> None:
+    """Model kwargs edited in place are picked up by the next request payload."""
+    model = FoundationModel(
+        provider="ecs.textgen.tgi",
+        model_type=ModelType.TEXTGEN,
+        model_name="model-name",
+        model_kwargs=ModelKwargs(stop_sequences=["a"]),
+    )
+    assert _build_payload(model, "test")["modelKwargs"]["stop_sequences"] == ["a"]
+
+    model.model_kwargs.stop_sequences.append("b")  # type: ignore
+    assert _build_payload(model, "test")["modelKwargs"]["stop_sequences"] == ["a", "b"]
+
+
+def test_on_llm_new_token_bytes_text_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Writes byte tokens to a stdout without a binary buffer, as in notebooks."""
+    stdout = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    on_llm_new_token_bytes("héllo".encode("utf-8"))
+
+    assert stdout.getvalue() == "héllo"
+
+
+def test_generate_stream_token_bytes(url: str, verify: Union[bool, str]) -> None:
+    """Streamed tokens are also available as UTF-8 bytes."""
+    client = Lisa(url=url, verify=verify)
+    text_gen_models = client.list_textgen_models()
+    model = [m for m in text_gen_models if m.provider == "ecs.textgen.tgi"][0]
+    model.model_kwargs.max_new_tokens = 2  # type: ignore
+    responses = list(client.generate_stream("what is deep learning?", model=model))
+
+    assert all(response.token_bytes == response.token.encode("utf-8") for response in responses)
+
+
+@pytest.mark.asyncio
+async def test_adescribe_models(url: str, verify: Union[bool, str]) -> None:
+    """Describes several models concurrently, returning them in request order."""
+    client = Lisa(url=url, verify=verify)
+    models = client.list_models()
+    requested = [(m.provider, m.model_name) for m in models]
+    described = await client.adescribe_models(requested)
+
+    assert [(m.provider, m.model_name) for m in described] == requested
+
+
+def test_clear_model_cache(url: str, verify: Union[bool, str]) -> None:
+    """Cached model metadata is copied on the way out and refetched after clearing the cache."""
+    client = Lisa(url=url, verify=verify)
+    model = client.list_textgen_models()[0]
+    described = client.describe_model(model.provider, model.model_name)
+    described.model_kwargs.max_new_tokens = 1234  # type: ignore
+
+    assert client.describe_model(model.provider, model.model_name).model_kwargs.max_new_tokens != 1234  # type: ignore
+
+    client.clear_model_cache()
+    assert client.describe_model(model.provider, model.model_name) == model
+
+
+def test_embed_return_numpy(url: str, verify: Union[bool, str]) -> None:
+    """Returns embeddings as a float32 NumPy array."""
+    np = pytest.importorskip("numpy")
+    client = Lisa(url=url, verify=verify)
+    embedding_models = client.list_embedding_models()
+    model = [m for m in embedding_models if m.provider == "ecs.embedding.instructor"][0]
+    embeddings = client.embed(["test", "another test"], model, return_numpy=True)
+
+    assert isinstance(embeddings, np.ndarray)
+    assert embeddings.dtype == np.float32
+    assert embeddings.shape[0] == 2
+
+
+def test_embed_compress_requests(url: str, verify: Union[bool, str]) -> None:
+    """Embeds a batch large enough to be sent gzip-compressed."""
+    client = Lisa(url=url, verify=verify, compress_requests=True)
+    embedding_models = client.list_embedding_models()
+    model = [m for m in embedding_models if m.provider == "ecs.embedding.instructor"][0]
+    texts = [f"test sentence number {i}" for i in range(200)]
+    embeddings = client.embed(texts, model)
+
+    assert len(embeddings) == len(texts)
+    assert all(isinstance(embedding[0], float) for embedding in embeddings)
+
+
+@pytest.mark.asyncio
+async def test_aembed_stream(url: str, verify: Union[bool, str]) -> None:
+    """Streams embeddings batch by batch, in input order."""
+    client = Lisa(url=url, verify=verify)
+    embedding_models = client.list_embedding_models()
+    model = [m for m in embedding_models if m.provider == "ecs.embedding.instructor"][0]
+    texts = [f"test {i}" for i in range(10)]
+    batches = [batch async for batch in client.aembed_stream(texts, model, batch_size=4)]
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+    batches = [batch async for batch in client.aembed_stream("test", model, batch_size=1)]
+    await client.aclose()
+
+    assert len(batches) == 1
+    assert len(batches[0]) == 1
+
+
+def test_context_manager(url: str, verify: Union[bool, str]) -> None:
+    """A client used as a context manager is closed on exit."""
+    with Lisa(url=url, verify=verify) as client:
+        client.list_models()
+
+    with pytest.raises(RuntimeError):
+        client.list_models()
+
+
+@pytest.mark.asyncio
+async def test_async_context_manager(url: str, verify: Union[bool, str]) -> None:
+    """A client used as an async context manager closes both clients on exit."""
+    async with Lisa(url=url, verify=verify) as client:
+        embedding_models = client.list_embedding_models()
+        model = [m for m in embedding_models if m.provider == "ecs.embedding.instructor"][0]
+        await client.aembed("test", model)
+
+    with pytest.raises(RuntimeError):
+        client.list_models()
+
+
+@pytest.fixture
+def https_proxy(monkeypatch: pytest.MonkeyPatch) -> str:
+    """Set HTTPS_PROXY as the only proxy variable in the environment."""
+    for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+    proxy = "http://proxy.example.com:3128"
+    monkeypatch.setenv("HTTPS_PROXY", proxy)
+    return proxy
+
+
+def test_env_proxy(https_proxy: str) -> None:
+    """Proxies set in the environment are mounted on the sync client."""
+    client = Lisa(url="https://lisa.example.com")
+
+    assert [pattern.pattern for pattern in client._session._mounts] == ["https://"]
+
+
+def test_env_no_proxy(https_proxy: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """NO_PROXY covering the API host disables the environment proxies."""
+    monkeypatch.setenv("NO_PROXY", "lisa.example.com")
+    client = Lisa(url="https://lisa.example.com")
+
+    assert not client._session._mounts
+
+
+def test_verify_ca_directory(tmp_path: Path) -> None:
+    """A directory of CA certificates is accepted for verify."""
+    client = Lisa(url="https://lisa.example.com", verify=str(tmp_path))
+    client.close()
@@ -0,0 +1,95 @@
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Test the gzip request body middleware of the REST API."""
+
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("starlette")
+
+from src.utils.gzip_request import GzipRequestMiddleware  # noqa: E402
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+from starlette.testclient import TestClient  # noqa: E402
+
+MAX_SIZE = 1024
+
+
+async def echo(request: Request) -> JSONResponse:
+    """Echo the request body and the headers the middleware rewrites."""
+    body = await request.body()
+    return JSONResponse(
+        {
+            "body": body.decode(),
+            "contentLength": request.headers.get("content-length"),
+            "contentEncoding": request.headers.get("content-encoding"),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def client() -> TestClient:
+    """Create a test client for an app behind the middleware."""
+    app = Starlette(
+        routes=[Route("/echo", echo, methods=["POST"])],
+        middleware=[Middleware(GzipRequestMiddleware, max_size=MAX_SIZE)],
+    )
+    return TestClient(app)
+
+
+def test_passthrough(client: TestClient) -> None:
+    """Requests without Content-Encoding are passed through untouched."""
+    body = json.dumps({"text": "test"}).encode()
+    response = client.post("/echo", content=body)
+
+    assert response.status_code == 200
+    assert response.json() == {"body": body.decode(), "contentLength": str(len(body)), "contentEncoding": None}
+
+
+def test_decompress(client: TestClient) -> None:
+    """Gzip bodies are decompressed and the encoding headers rewritten."""
+    body = json.dumps({"text": ["test"] * 100}).encode()
+    response = client.post("/echo", content=gzip.compress(body), headers={"Content-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.json() == {"body": body.decode(), "contentLength": str(len(body)), "contentEncoding": None}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"not gzip",
+        gzip.compress(b'{"text": "test"}')[:-8],
+        gzip.compress(b'{"text": "test"}') + b"trailing",
+    ],
+    ids=["invalid", "truncated", "trailing"],
+)
+def test_invalid_body(client: TestClient, content: bytes) -> None:
+    """Bodies that are not exactly one complete gzip stream are rejected."""
+    response = client.post("/echo", content=content, headers={"Content-Encoding": "gzip"})
+
+    assert response.status_code == 400
+
+
+def test_body_too_large(client: TestClient) -> None:
+    """Bodies that decompress past the size limit are rejected."""
+    response = client.post("/echo", content=gzip.compress(b"x" * (MAX_SIZE + 1)), headers={"Content-Encoding": "gzip"})
+
+    assert response.status_code == 413